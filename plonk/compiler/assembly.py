@@ -1,13 +1,11 @@
-from utils import *
+from curve import Scalar
 from .utils import *
-from typing import Optional
-from dataclasses import dataclass
+import functools
+from typing import Iterator, Optional, Union, cast
+from dataclasses import dataclass, field
 
-# from plonk.curve import Scalar
-# from plonk.curve import Scalar
 
-
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GateWires:
     """
     `GateWires` Class
@@ -27,11 +25,15 @@ class GateWires:
     R: Optional[str]
     O: Optional[str]
 
+    def __iter__(self) -> Iterator[Optional[str]]:
+        """Iterate over the left, right and output wires without building a list"""
+        return iter((self.L, self.R, self.O))
+
     def as_list(self) -> list[Optional[str]]:
-        return [self.L, self.R, self.O]
+        return list(iter(self))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Gate:
     """Gate polynomial"""
 
@@ -42,7 +44,7 @@ class Gate:
     C: Scalar
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AssemblyEqn:
     """
     AssemblyEqn Class
@@ -69,110 +71,244 @@ class AssemblyEqn:
 
     In order to satisfy the constraints we would need to supply six numbers as wire values that make all of the equations correct. For example, `x = (3, 9, 4, 16, 5, 25)` would work as would `x = (5, 25, 12, 144, 13, 169)`
     """
-    coeffs: dict[Optional[str], int]
-    """A dictionary that associates optional variable names with integer coefficients. These coefficients are used to express the mathematical relationships between the wires in the equation. The keys in the dictionary can be optional variable names, or they can be None to represent constants, and the corresponding values are integer coefficients."""
+    coeffs: dict[CoeffKey, int]
+    """A dictionary that associates optional variable names with integer coefficients. These coefficients are used to express the mathematical relationships between the wires in the equation. The keys in the dictionary can be variable names, sorted tuples of variable names for products, or the empty string to represent constants, and the corresponding values are integer coefficients."""
+    _gate: Optional[Gate] = field(default=None, init=False, repr=False, compare=False)
+    """Cache of the `gate` property"""
+    _packed: tuple[int, int, int, int, int] = field(
+        init=False, repr=False, compare=False
+    )
+    """The L, R, M, O and C coefficients as plain integers, packed once at construction"""
+
+    def __post_init__(self):
+        # The dataclass is frozen, so bypass `__setattr__` to fill the packed coefficients
+        object.__setattr__(self, "_packed", self._pack_coeffs())
 
     def L(self) -> Scalar:
         """Get the coefficient of the L wire and negate it (0 is the default coefficient) to return its finite field representation"""
-        return Scalar(-self.coeffs.get(self.wires.L, 0))
+        return Scalar.of(self._packed[0])
 
     def R(self) -> Scalar:
         """Get the coefficient of the R wire and negate it (0 is the default coefficient) to return its finite field representation"""
-        if self.wires.R != self.wires.L:
-            return Scalar(-self.coeffs.get(self.wires.R, 0))
-        return Scalar(0)
+        return Scalar.of(self._packed[1])
 
     def C(self) -> Scalar:
         """Get the coefficient of the "" (empty) wire and negate it (0 is the default coefficient) to return its finite field representation"""
-        return Scalar(-self.coeffs.get("", 0))
+        return Scalar.of(self._packed[4])
 
     def O(self) -> Scalar:
         """Get the coefficient of the output wire (1 is the default coefficient) to return its finite field representation"""
-        return Scalar(self.coeffs.get("$output_coeff", 1))
+        return Scalar.of(self._packed[3])
 
     def M(self) -> Scalar:
         """Get the coefficient of the multiplication (M) wire and negate it (0 is the default coefficient) to return its finite field representation"""
-        if None not in self.wires.as_list():
-            return Scalar(
-                -self.coeffs.get(get_product_key(self.wires.L, self.wires.R), 0)
+        return Scalar.of(self._packed[2])
+
+    def coeffs_raw(self) -> tuple[int, int, int, int, int]:
+        """Get the L, R, M, O and C coefficients as plain integers, following the same sign and default rules as the methods above"""
+        return self._packed
+
+    def _pack_coeffs(self) -> tuple[int, int, int, int, int]:
+        """Compute the L, R, M, O and C coefficients as plain integers from the coefficients dictionary"""
+        L, R = self.wires.L, self.wires.R
+        coeffs = self.coeffs
+
+        # Constant gates such as `a === 9` only carry the output and constant coefficients
+        if L is None and R is None:
+            return (0, 0, 0, coeffs.get("$output_coeff", 1), -coeffs.get("", 0))
+
+        # Gates with a single wire, such as `a public`, have no multiplication term
+        if R is None:
+            # Both wires unset was handled above
+            assert L is not None
+            return (
+                -coeffs.get(L, 0),
+                0,
+                0,
+                coeffs.get("$output_coeff", 1),
+                -coeffs.get("", 0),
             )
-        return Scalar(0)
+        if L is None:
+            return (
+                0,
+                -coeffs.get(R, 0),
+                0,
+                coeffs.get("$output_coeff", 1),
+                -coeffs.get("", 0),
+            )
+
+        # General case with both input wires set
+        return (
+            -coeffs.get(L, 0),
+            -coeffs.get(R, 0) if R != L else 0,
+            -coeffs.get(get_product_key(L, R), 0) if self.wires.O is not None else 0,
+            coeffs.get("$output_coeff", 1),
+            -coeffs.get("", 0),
+        )
 
+    @property
     def gate(self) -> Gate:
-        return Gate(self.L(), self.R(), self.M(), self.O(), self.C())
+        """Get the gate coefficients, computed on first access and cached afterwards"""
+        gate = self._gate
+        if gate is None:
+            gate = Gate(self.L(), self.R(), self.M(), self.O(), self.C())
+            # The dataclass is frozen, so bypass `__setattr__` to fill the cache slot
+            object.__setattr__(self, "_gate", gate)
+        return gate
 
 
-def evaluate(exprs: list[str], first_is_negative=False) -> dict[Optional[str], int]:
-    """Evaluate an arithmetic expression and return a mapping of terms to coefficients"""
+# Precedence of the binary operators supported by the expression evaluator
+_PRECEDENCE = {"+": 1, "-": 1, "*": 2}
 
-    # If the expression contains '+', split it into left and right parts
-    # For example `a + b` gives {'a': 1, 'b': 1}
-    if "+" in exprs:
-        L = evaluate(exprs[: exprs.index("+")], first_is_negative)
-        R = evaluate(exprs[exprs.index("+") + 1 :], False)
-
-        # Merge the results for left and right expressions
-        return L | R
-
-    # If the expression contains '-', split it into left and right parts
-    # For example `a - b` gives {'a': 1, 'b': -1}
-    elif "-" in exprs:
-        L = evaluate(exprs[: exprs.index("-")], first_is_negative)
-        R = evaluate(exprs[exprs.index("-") + 1 :], True)
-
-        # Merge the results for left and right expressions
-        return L | R
-
-    # If the expression contains '*', split it into left and right parts
-    # For example `a * b * 2 * c * 2` gives {'a*b*c': 4}
-    elif "*" in exprs:
-        L = evaluate(exprs[: exprs.index("*")], first_is_negative)
-        R = evaluate(exprs[exprs.index("*") + 1 :], first_is_negative)
-        output = {}
-
-        # Calculate the product of terms from left and right expressions
-        for k1 in L.keys():
-            for k2 in R.keys():
-                output[get_product_key(k1, k2)] = L[k1] * R[k2]
-
-        return output
-
-    # If the expression contains more than one token, raise an exception
-    # For example `a b` is not allowed
-    elif len(exprs) > 1:
-        raise Exception(
-            "No operators found; expected sub-expression to be a unit: {}".format(
-                exprs[1]
-            )
-        )
+# A classified token of an expression: its kind ("op", "num" or "var") and its value
+Token = tuple[str, Union[str, int]]
 
-    # If the first token has a negative sign, remove it and toggle the first_is_negative flag
-    elif exprs[0][0] == "-":
-        return evaluate([exprs[0][1:]], not first_is_negative)
 
-    # If the first token is a numeric value, convert it to an integer
-    # For example `['2']` gives `{'': 2}` if not first_is_negative and `{'': -2}` if first_is_negative
-    elif exprs[0].isnumeric():
-        # Create a dictionary with an empty string as the key and the coefficient (-1 or 1) based on `first_is_negative`
-        return {"": int(exprs[0]) * (-1 if first_is_negative else 1)}
+def _tokenize(exprs: list[str]) -> list[Token]:
+    """
+    Classify the tokens of an arithmetic expression into `(kind, value)` pairs.
 
-    # If the first token is a valid variable name, set its coefficient based on the flag
-    # For example `['a']` gives `{'a': 1}` if not first_is_negative and `{'a': 1}` if first_is_negative
-    elif is_valid_variable_name(exprs[0]):
-        # Create a dictionary with the variable name as the key and the coefficient (-1 or 1) based on `first_is_negative`
-        return {exprs[0]: -1 if first_is_negative else 1}
+    The kind is one of:
+    - `"op"` for a binary operator (`+`, `-` or `*`),
+    - `"num"` for an integer literal,
+    - `"var"` for a variable name.
 
-    # If none of the above conditions match, raise an exception
-    else:
-        raise Exception("Unknown token: {}".format(exprs[0]))
+    A leading minus sign on an operand is rewritten as a multiplication by `-1`.
+    For example `['a', '+', '-b']` gives `[('var', 'a'), ('op', '+'), ('num', -1), ('op', '*'), ('var', 'b')]`
+    """
+    tokens: list[Token] = []
+    for expr in exprs:
+        # Operators are recognized as-is
+        if expr in _PRECEDENCE:
+            tokens.append(("op", expr))
+            continue
+
+        # Strip the leading minus signs of the operand, each one toggling the sign
+        operand = expr.lstrip("-")
+        if (len(expr) - len(operand)) % 2 == 1:
+            tokens += [("num", -1), ("op", "*")]
+
+        # If the operand is a numeric value, convert it to an integer
+        if operand.isnumeric():
+            tokens.append(("num", int(operand)))
+        # If the operand is a valid variable name, keep it as is
+        elif is_valid_variable_name(operand):
+            tokens.append(("var", operand))
+        # If none of the above conditions match, raise an exception
+        else:
+            raise Exception("Unknown token: {}".format(operand))
+    return tokens
 
 
-def eq_to_assembly(eq: str) -> AssemblyEqn:
+def _to_rpn(tokens: list[Token]) -> list[Token]:
+    """
+    Reorder classified tokens into Reverse Polish Notation using the shunting-yard algorithm.
+
+    All the operators are left-associative and `*` binds tighter than `+` and `-`.
+    For example `a - b * 2` gives `a b 2 * -`
+    """
+    output: list[Token] = []
+    operators: list[Token] = []
+    # Operands and operators must alternate, starting and ending with an operand
+    expect_operand = True
+    for kind, value in tokens:
+        if kind == "op":
+            if expect_operand:
+                raise Exception("Missing operand before operator: {}".format(value))
+            # Pop the pending operators binding at least as tightly as this one
+            precedence = _PRECEDENCE[cast(str, value)]
+            while operators and _PRECEDENCE[cast(str, operators[-1][1])] >= precedence:
+                output.append(operators.pop())
+            operators.append((kind, value))
+        else:
+            # For example `a b` is not allowed
+            if not expect_operand:
+                raise Exception(
+                    "No operators found; expected sub-expression to be a unit: {}".format(
+                        value
+                    )
+                )
+            output.append((kind, value))
+        expect_operand = kind == "op"
+
+    if expect_operand:
+        raise Exception("Missing operand at the end of the expression")
+
+    # Flush the remaining operators, the most recently pushed first
+    return output + operators[::-1]
+
+
+def _fold_rpn(rpn: list[Token]) -> dict[CoeffKey, int]:
+    """Fold a Reverse Polish Notation token stream into a mapping of terms to coefficients"""
+    stack: list[dict[CoeffKey, int]] = []
+    for kind, value in rpn:
+        # For example `2` gives `{'': 2}`
+        if kind == "num":
+            stack.append({"": cast(int, value)})
+        # For example `a` gives `{'a': 1}`
+        elif kind == "var":
+            stack.append({cast(str, value): 1})
+        else:
+            R = stack.pop()
+            L = stack.pop()
+            # Calculate the product of terms from left and right expressions
+            # For example `a * b * 2 * c * 2` gives {('a', 'b', 'c'): 4}
+            if value == "*":
+                output: dict[CoeffKey, int] = {}
+                for k1 in L:
+                    for k2 in R:
+                        key = get_product_key(k1, k2)
+                        output[key] = output.get(key, 0) + L[k1] * R[k2]
+                stack.append(output)
+            # Accumulate the right expression into the left one, in place
+            # For example `a - b` gives {'a': 1, 'b': -1} and `a + a` gives {'a': 2}
+            else:
+                sign = 1 if value == "+" else -1
+                for k, v in R.items():
+                    L[k] = L.get(k, 0) + sign * v
+                stack.append(L)
+    return stack.pop()
+
+
+@functools.lru_cache(maxsize=1024)
+def _evaluate_cached(
+    exprs: tuple[str, ...], first_is_negative: bool
+) -> dict[CoeffKey, int]:
+    """Memoized evaluation of an arithmetic expression, the returned mapping must not be mutated"""
+    tokens = _tokenize(list(exprs))
+
+    # Negate the first term of the expression, for example `a * b + c` becomes `-1 * a * b + c`
+    if first_is_negative:
+        negation: list[Token] = [("num", -1), ("op", "*")]
+        tokens = negation + tokens
+
+    return _fold_rpn(_to_rpn(tokens))
+
+
+def evaluate(exprs: list[str], first_is_negative=False) -> dict[CoeffKey, int]:
+    """Evaluate an arithmetic expression and return a mapping of terms to coefficients"""
+    # Return a copy so that callers are free to mutate the mapping without corrupting the cache
+    return dict(_evaluate_cached(tuple(exprs), first_is_negative))
+
+
+def simplify_coeffs(coeffs: dict[CoeffKey, int]) -> dict[CoeffKey, int]:
+    """
+    Simplify a mapping of terms to coefficients by dropping the terms whose coefficient is zero.
+
+    For example `{'a': 1, ('b', 'c'): 0, '': 0}` gives `{'a': 1}`
+    """
+    return {key: coeff for key, coeff in coeffs.items() if coeff != 0}
+
+
+@functools.lru_cache(maxsize=1024)
+def eq_to_assembly(eq: str, simplify: bool = False) -> AssemblyEqn:
     """
     Converts an equation to a mapping of terms to coefficients, validates operations, and constructs an Assembly Equation.
 
     Args:
         eq (str): The equation in string format.
+        simplify (bool): Whether to simplify the coefficient map (see `simplify_coeffs`) before building the gate.
+            Variables whose terms cancel out then no longer take a wire, so for example `e <== a + b + 0 * c` fits in a single gate.
 
     Returns:
         AssemblyEqn: An Assembly Equation representing the input equation.
@@ -188,10 +324,12 @@ def eq_to_assembly(eq: str) -> AssemblyEqn:
 
     Additionally, this function verifies the equation's validity by checking the operation and variable constraints. It supports a maximum multiplicative degree of 2. If the equation defines a public variable, it creates an AssemblyEqn with the corresponding information. If the operation is unsupported, it raises an exception.
 
+    Results are memoized by equation string, so repeated equations share the same (frozen) `AssemblyEqn` instance.
+
     Examples:
     - `a === 9` returns `([None, None, 'a'], {'': 9})`
-    - `b <== a * c` returns `(['a', 'c', 'b'], {'a*c': 1})`
-    - `d <== a * c - 45 * a + 987` returns `(['a', 'c', 'd'], {'a*c': 1, 'a': -45, '': 987})`
+    - `b <== a * c` returns `(['a', 'c', 'b'], {('a', 'c'): 1})`
+    - `d <== a * c - 45 * a + 987` returns `(['a', 'c', 'd'], {('a', 'c'): 1, 'a': -45, '': 987})`
 
     Examples of invalid equations:
     - `7 === 7`  # Can't assign to non-variable
@@ -207,8 +345,13 @@ def eq_to_assembly(eq: str) -> AssemblyEqn:
         # Extract the output variable which is the first token
         out = tokens[0]
 
+        # The expression is made of the tokens starting from the third token (index 2)
+        exprs = tokens[2:]
+
         # Convert the expression to coefficient map form
-        coeffs = evaluate(tokens[2:])
+        coeffs = evaluate(exprs)
+        if simplify:
+            coeffs = simplify_coeffs(coeffs)
 
         # Handle the special case where output variable starts with a minus sign
         # for example "-x === a * b"
@@ -223,19 +366,24 @@ def eq_to_assembly(eq: str) -> AssemblyEqn:
             raise Exception("Invalid out variable name: {}".format(out))
 
         # Gather list of variables used in the expression
-        # Create an empty list to store the variables found in the expression
-        variables = []
-        # Iterate through the tokens starting from the third token (index 2)
-        for t in tokens[2:]:
+        # Use a dictionary as an ordered set to find the variables in order of first appearance
+        found: dict[str, None] = {}
+        # Iterate through the tokens of the expression
+        for t in exprs:
             # Remove a possible leading "-" sign to get the variable name
             var = t.lstrip("-")
-            # Check if the variable name is valid and it hasn't been added to the list
-            if is_valid_variable_name(var) and var not in variables:
-                # If valid and not already in the list, add it to the variables list
-                variables.append(var)
+            # Check if the variable name is valid, duplicates are merged by the dictionary
+            if is_valid_variable_name(var):
+                found[var] = None
+        variables = list(found)
+
+        # When simplifying, only keep the variables still appearing in the coefficient map
+        if simplify:
+            used = {name for key in coeffs for name in key_variables(key)}
+            variables = [var for var in variables if var in used]
 
         # Construct the list of allowed coefficients
-        allowed_coeffs = variables + ["", "$output_coeff"]
+        allowed_coeffs: list[CoeffKey] = [*variables, "", "$output_coeff"]
         if len(variables) == 0:
             pass
         elif len(variables) == 1:
@@ -259,7 +407,7 @@ def eq_to_assembly(eq: str) -> AssemblyEqn:
             if key not in allowed_coeffs:
                 raise Exception(
                     "Invalid multiplication coefficient: '{}' is not allowed.".format(
-                        key
+                        format_key(key)
                     )
                 )
         # Create a list of wires to define the gate structure
@@ -1,9 +1,14 @@
 # from utils import *
 
+import functools
+from collections import defaultdict
 from .utils import *
 from poly import Polynomial, Basis
 from .assembly import *
 
+# The columns are fixed, bind them once for the loops
+_COLUMN_VARIANTS = Column.variants()
+
 
 @dataclass
 class CommonPreprocessedInput:
@@ -51,6 +56,23 @@ class CommonPreprocessedInput:
     """`S_σ3(X)` third permutation polynomial"""
 
 
+def _rotate(
+    sorted_uses: list[int],
+    roots: tuple[Scalar, ...],
+    S_values: dict[int, list[Scalar]],
+) -> None:
+    """
+    Rotate the packed positions of a variable by one and store their labels in `S_values`.
+
+    The label of each position (see `Cell.label`) is stored at the next position in `sorted_uses`,
+    cycling back to the first element for the last one. `roots` are the roots of unity of the group order.
+    """
+    for code, next_code in zip(sorted_uses, sorted_uses[1:] + sorted_uses[:1]):
+        column, row = unpack(code)
+        next_column, next_row = unpack(next_code)
+        S_values[next_column][next_row] = roots[row] * column
+
+
 class Program:
     """
     Let us take an example with the Pythagorean theorem represented by the equations:
@@ -84,26 +106,49 @@ class Program:
     constraints: list[AssemblyEqn]
     group_order: int
 
-    def __init__(self, constraints: list[str], group_order: int):
+    def __init__(
+        self, constraints: list[str], group_order: int, simplify: bool = False
+    ):
         """
         Initialize a Program instance.
 
         Parameters:
         - constraints (list[str]): A list of constraint strings representing the equations in the program.
         - group_order (int): The order of the group. It should be greater than or equal to the number of constraints.
+        - simplify (bool): Whether to simplify the coefficients of each constraint before building its gate (see `simplify_coeffs`).
 
         Raises:
         - Exception: If the group order is smaller than the number of constraints.
         """
         if len(constraints) > group_order:
             raise Exception("Group order too small")
-        assembly = [eq_to_assembly(constraint) for constraint in constraints]
+        assembly = [eq_to_assembly(constraint, simplify) for constraint in constraints]
         self.constraints = assembly
         self.group_order = group_order
 
     def common_preprocessed_input(self) -> CommonPreprocessedInput:
-        L, R, M, O, C = self.make_gate_polynomials()
-        S = self.make_s_polynomials()
+        """Get the common preprocessed input, computed once per program (see `preprocessed_input`)"""
+        return self.preprocessed_input
+
+    def make_s_polynomials(self) -> dict[Column, Polynomial]:
+        """Get the permutation polynomials, computed once per program (see `s_polynomials`)"""
+        return self.s_polynomials
+
+    def make_gate_polynomials(
+        self,
+    ) -> tuple[Polynomial, Polynomial, Polynomial, Polynomial, Polynomial]:
+        """Get the gate polynomials, computed once per program (see `gate_polynomials`)"""
+        return self.gate_polynomials
+
+    @functools.cached_property
+    def preprocessed_input(self) -> CommonPreprocessedInput:
+        """
+        Common preprocessed input of the program, built from the cached gate and permutation polynomials.
+
+        The preprocessed polynomials are cached on the instance, so `constraints` must not be modified once they are computed.
+        """
+        L, R, M, O, C = self.gate_polynomials
+        S = self.s_polynomials
         return CommonPreprocessedInput(
             self.group_order,
             M,
@@ -116,48 +161,52 @@ class Program:
             S[Column.OUTPUT],
         )
 
-    def make_s_polynomials(self) -> dict[Column, Polynomial]:
+    @functools.cached_property
+    def s_polynomials(self) -> dict[Column, Polynomial]:
+        """Permutation polynomials `S_σ1`, `S_σ2` and `S_σ3` encoding the copy constraints, by column"""
         # For each variable, extract the list of (column, row) positions
         # where that variable is used
-        variable_uses: dict[Optional[str], Set[Cell]] = {None: set()}
+        # Positions are packed into integers (see `pack`), which are cheaper to build and sort than `Cell`s.
+        variable_uses: defaultdict[Optional[str], list[int]] = defaultdict(list)
 
         # Example:
         # For a list of wire constraints ['a', 'b', 'c'], the resulting 'variable_uses' dictionary would look like this:
         # {
-        #     None: set(),
-        #     'a': {(0, 1)},
-        #     'b': {(0, 2)},
-        #     'c': {(0, 3)}
+        #     None: [],
+        #     'a': [1],  # pack(Column.LEFT, 0)
+        #     'b': [2],  # pack(Column.RIGHT, 0)
+        #     'c': [3]   # pack(Column.OUTPUT, 0)
         # }
         #
-        # In this example, each variable ('a', 'b', 'c') is associated with the (row, column) positions where it is used in the constraints.
-        # The positions are recorded in sets to avoid duplicates. The 'None' key in the dictionary is used to store positions where no variable is used.
+        # In this example, each variable ('a', 'b', 'c') is associated with the packed (column, row) positions where it is used in the constraints.
+        # Each (column, row) position is visited exactly once, so plain lists are enough. The 'None' key in the dictionary is used to store positions where no variable is used.
 
         # Iterate through each constraint and identify the positions where each variable is used.
         for row, constraint in enumerate(self.constraints):
-            for column, value in zip(Column.variants(), constraint.wires.as_list()):
-                if value not in variable_uses:
-                    variable_uses[value] = set()
+            for column, value in zip(_COLUMN_VARIANTS, constraint.wires):
                 # Add (row, column) position
-                variable_uses[value].add(Cell(column, row))
+                variable_uses[value].append(pack(column, row))
 
         # Iterate through rows beyond the constraints and to the group order and mark all cells as unused.
         # This is necessary to ensure that any cells not utilized by constraints are explicitly marked as unused.
-        for row in range(len(self.constraints), self.group_order):
-            # Iterate through all possible columns (variants) within a row.
-            for column in Column.variants():
-                # Add the cell (column, row) to the set associated with 'None',
-                # indicating that it is not used by any variable.
-                variable_uses[None].add(Cell(column, row))
+        # Add the cells (column, row) of all possible columns (variants) to the list associated with 'None',
+        # indicating that they are not used by any variable.
+        variable_uses[None].extend(
+            pack(column, row)
+            for row in range(len(self.constraints), self.group_order)
+            for column in _COLUMN_VARIANTS
+        )
 
         # Initialize dictionaries to store field elements in S_values for different columns.
-        # We use three separate dictionaries for LEFT, RIGHT, and OUTPUT columns.
-        S_values = {
-            Column.LEFT: [Scalar(0)] * self.group_order,
-            Column.RIGHT: [Scalar(0)] * self.group_order,
-            Column.OUTPUT: [Scalar(0)] * self.group_order,
+        # We use three separate lists for LEFT, RIGHT, and OUTPUT columns, keyed by column.
+        # The keys are typed as ints since `_rotate` looks them up with the unpacked column values.
+        S_values: dict[int, list[Scalar]] = {
+            column: Scalar.zeros(self.group_order) for column in _COLUMN_VARIANTS
         }
 
+        # Compute the roots of unity once, they give the label of every cell
+        roots = Scalar.roots_of_unity(self.group_order)
+
         # Iterate through variables and their associated uses.
         for _, uses in variable_uses.items():
             # Sort the list of uses by (row, column) positions, ensuring a consistent order.
@@ -173,15 +222,7 @@ class Program:
             # - at S[LEFT][7], the field element represents the position (LEFT, 4)
             # - at S[OUTPUT][2], the field element represents the position (LEFT, 7)
             # - at S[LEFT][4], the field element represents the position (OUTPUT, 2)
-            for i, cell in enumerate(sorted_uses):
-                # Determine the next position by taking the next element in the sorted list,
-                # cycling back to the first element if needed.
-                next_i = (i + 1) % len(sorted_uses)
-                next_column = sorted_uses[next_i].column
-                next_row = sorted_uses[next_i].row
-
-                # Store the field element in S_values for the next (column, row) position.
-                S_values[next_column][next_row] = cell.label(self.group_order)
+            _rotate(sorted_uses, roots, S_values)
 
         return {
             Column.LEFT: Polynomial(S_values[Column.LEFT], Basis.LAGRANGE),
@@ -189,7 +230,8 @@ class Program:
             Column.OUTPUT: Polynomial(S_values[Column.OUTPUT], Basis.LAGRANGE),
         }
 
-    def make_gate_polynomials(
+    @functools.cached_property
+    def gate_polynomials(
         self,
     ) -> tuple[Polynomial, Polynomial, Polynomial, Polynomial, Polynomial]:
         """
@@ -199,31 +241,28 @@ class Program:
         parts of the constraint system, such as the left (L), right (R), mid (M), output (O), and control (C) sides of the gates.
         """
 
-        # Create empty lists for storing coefficients
-        L = [Scalar(0) for _ in range(self.group_order)]  # Left
-        R = [Scalar(0) for _ in range(self.group_order)]  # Right
-        M = [Scalar(0) for _ in range(self.group_order)]  # Multiplication
-        O = [Scalar(0) for _ in range(self.group_order)]  # Output
-        C = [Scalar(0) for _ in range(self.group_order)]  # Constant
-
-        # Iterate through each constraint and extract gate coefficients
-        for i, constraint in enumerate(self.constraints):
-            gate = constraint.gate()
-            L[i] = gate.L
-            R[i] = gate.R
-            M[i] = gate.M
-            O[i] = gate.O
-            C[i] = gate.C
-
-        # Create Polynomial instances from the coefficient lists
-        # using Lagrange basis
-        return (
-            Polynomial(L, Basis.LAGRANGE),
-            Polynomial(R, Basis.LAGRANGE),
-            Polynomial(M, Basis.LAGRANGE),
-            Polynomial(O, Basis.LAGRANGE),
-            Polynomial(C, Basis.LAGRANGE),
+        # Transpose the packed (L, R, M, O, C) coefficients of each constraint into
+        # one row per selector (structure of arrays), an empty program gives five empty rows
+        L, R, M, O, C = (
+            list(zip(*(constraint.coeffs_raw() for constraint in self.constraints)))
+            or [()] * 5
         )
 
+        # Rows beyond the constraints are unused and their coefficients are 0
+        padding = Scalar.zeros(self.group_order - len(self.constraints))
 
-Program(["c <== a * b"], 8).common_preprocessed_input()
+        # Create Polynomial instances from the coefficient rows
+        # using Lagrange basis, small coefficients share interned field elements
+        def to_polynomial(row: tuple[int, ...]) -> Polynomial:
+            return Polynomial(
+                [Scalar.of(x) for x in row] + padding,
+                Basis.LAGRANGE,
+            )
+
+        return (
+            to_polynomial(L),
+            to_polynomial(R),
+            to_polynomial(M),
+            to_polynomial(O),
+            to_polynomial(C),
+        )
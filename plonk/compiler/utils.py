@@ -1,45 +1,76 @@
-from utils import *
-from .utils import *
-from enum import Enum
-from dataclasses import dataclass
+from curve import Scalar
+import functools
+from enum import IntEnum
+from dataclasses import dataclass, field
+from typing import ClassVar, Optional, Union
 
 
-class Column(Enum):
+class Column(IntEnum):
+    """
+    Column of a cell in the execution trace.
+
+    Columns are ints, so they compare, hash and multiply like their values without going through `.value`.
+    """
+
     LEFT = 1
     RIGHT = 2
     OUTPUT = 3
 
-    def __lt__(self, other):
-        if self.__class__ is other.__class__:
-            return self.value < other.value
-        return NotImplemented
+    _VARIANTS: ClassVar[tuple["Column", ...]]
+    """All the columns in order, shared by every call to `variants`"""
 
     @staticmethod
-    def variants():
-        return [Column.LEFT, Column.RIGHT, Column.OUTPUT]
+    def variants() -> tuple["Column", ...]:
+        return Column._VARIANTS
+
+
+# The members only exist once the enum is defined, and an assignment in its body would make another member
+Column._VARIANTS = (Column.LEFT, Column.RIGHT, Column.OUTPUT)
+
+
+def pack(column: int, row: int) -> int:
+    """
+    Pack a (column, row) position into a single integer.
+
+    The row takes the high bits and the column value (1 to 3) the two low bits, so sorting the
+    packed positions orders them by row first and then by column, as `Cell` does.
+    """
+    return (row << 2) | column
 
 
-@dataclass
+def unpack(code: int) -> tuple[int, int]:
+    """Unpack an integer built by `pack` back into its (column, row) position"""
+    return code & 3, code >> 2
+
+
+@dataclass(slots=True, frozen=True, eq=False)
 class Cell:
     column: Column
     row: int
+    _key: int = field(init=False, repr=False)
+    """Column and row packed in a single int (see `pack`), ordered by row first then column"""
 
-    def __key(self):
-        return (self.row, self.column.value)
+    def __post_init__(self):
+        # Cells are hashed and compared over and over when building the permutation, so the key is computed once
+        object.__setattr__(self, "_key", pack(self.column, self.row))
 
     def __hash__(self):
-        return hash(self.__key())
+        return self._key
 
-    def __lt__(self, other):
+    def __eq__(self, other):
         if self.__class__ is other.__class__:
-            return self.__key() < other.__key()
+            return self._key == other._key
         return NotImplemented
 
-    def __repr__(self) -> str:
-        return "(" + str(self.row) + ", " + str(self.column.value) + ")"
+    def __lt__(self, other):
+        if self.__class__ is other.__class__:
+            return self._key < other._key
+        return NotImplemented
 
     def __str__(self) -> str:
-        return "(" + str(self.row) + ", " + str(self.column.value) + ")"
+        return f"({self.row}, {self.column.value})"
+
+    __repr__ = __str__
 
     def label(self, group_order: int) -> Scalar:
         """
@@ -52,37 +83,66 @@ class Cell:
         assert self.row < group_order  # Ensure that the row is within the valid range.
 
         # Perform polynomial interpolation
-        return Scalar.roots_of_unity(group_order)[self.row] * self.column.value
+        return Scalar.roots_of_unity(group_order)[self.row] * self.column
 
 
-def get_product_key(key1, key2):
+# Key of the coefficients dictionary: the constant (''), a variable name, or a sorted tuple of variable names for a product
+CoeffKey = Union[str, tuple[str, ...]]
+
+
+def key_variables(key: Optional[CoeffKey]) -> tuple[str, ...]:
+    """Get the variable names of a coefficients dictionary key, the constant key ('') has none"""
+    if not key:
+        return ()
+    if isinstance(key, str):
+        return (key,)
+    return key
+
+
+@functools.lru_cache(maxsize=4096)
+def get_product_key(key1: Optional[CoeffKey], key2: Optional[CoeffKey]) -> CoeffKey:
     """
     Get the product key for the coefficients dictionary for the term `key1 * key2`.
 
     Args:
-        key1 (str): The first key, which can be a constant (''), a variable, or a product key.
-        key2 (str): The second key, which can be a constant (''), a variable, or a product key.
+        key1 (CoeffKey): The first key, which can be a constant (''), a variable, or a product key.
+        key2 (CoeffKey): The second key, which can be a constant (''), a variable, or a product key.
 
     Returns:
-        str: The product key to use in the coefficients dictionary for the term `key1 * key2`.
+        CoeffKey: The product key to use in the coefficients dictionary for the term `key1 * key2`.
+        Single variables stay plain strings while products of several variables are sorted tuples,
+        for example `get_product_key('b', 'a')` gives `('a', 'b')`.
 
     Note:
     Degrees higher than 2 are disallowed in the compiler, but we still allow them in the parser
     in case we find a way to compile them later.
+
+    The same few pairs of keys come up over and over while evaluating equations, and the keys are
+    hashable, so the results are cached.
     """
-    # Split the keys into elements, removing empty elements
-    key1_elements = [elem for elem in (key1 or "").split("*") if elem]
-    key2_elements = [elem for elem in (key2 or "").split("*") if elem]
+    # Multiplying by a constant keeps the other key, which is already in its sorted form
+    if not key1:
+        return key2 or ""
+    if not key2:
+        return key1
+
+    # Combine and sort the variable names from both keys
+    combined_elements = tuple(sorted(key_variables(key1) + key_variables(key2)))
 
-    # Combine and sort the elements from both keys
-    combined_elements = sorted(key1_elements + key2_elements)
+    # Constants and single variables keep their string form
+    if len(combined_elements) == 0:
+        return ""
+    if len(combined_elements) == 1:
+        return combined_elements[0]
+    return combined_elements
 
-    # Reconstruct the final product key using '*'
-    product_key = "*".join(combined_elements)
 
-    return product_key
+def format_key(key: CoeffKey) -> str:
+    """Render a coefficients dictionary key as written in equations, for example `('a', 'b')` gives `a*b`"""
+    return key if isinstance(key, str) else "*".join(key)
 
 
+@functools.lru_cache(maxsize=4096)
 def is_valid_variable_name(name: str) -> bool:
     """
     Check if a string is a valid variable name.
@@ -98,4 +158,5 @@ def is_valid_variable_name(name: str) -> bool:
     2. All characters in the string must be alphanumeric, consisting of letters (A-Z or a-z) and numbers (0-9).
     3. The string cannot start with a numeric digit (0-9). It must begin with a letter.
     """
-    return len(name) > 0 and name.isalnum() and name[0] not in "0123456789"
+    # `isalnum` is false for the empty string, so it also covers condition 1
+    return name.isalnum() and not ("0" <= name[0] <= "9")
@@ -1,10 +1,31 @@
+import functools
 import py_ecc.bn128 as b
 from typing import NewType
 from py_ecc.fields.field_elements import FQ as Field
 
+# GMP is optional, it only speeds up the modular exponentiations when installed
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
 G1Point = NewType("G1Point", tuple[b.FQ, b.FQ])
 G2Point = NewType("G2Point", tuple[b.FQ2, b.FQ2])
 
+# Order of the curve, the modulus of the scalar field, as a module constant for the integer loops
+_P = b.curve_order
+
+
+def powmod(base: int, exponent: int, modulus: int) -> int:
+    """
+    Gets `base^exponent mod modulus` as a plain integer, negative exponents giving powers of the inverse.
+
+    This goes through GMP when `gmpy2` is installed, and through the builtin `pow` otherwise.
+    """
+    if gmpy2 is not None:
+        return int(gmpy2.powmod(base, exponent, modulus))
+    return pow(base, exponent, modulus)
+
 
 class Scalar(Field):
     """
@@ -23,7 +44,49 @@ class Scalar(Field):
     ensuring scalar values stay within a valid range.
     """
 
-    field_modulus = b.curve_order
+    field_modulus = _P
+
+    ZERO: "Scalar"
+    """Shared zero element, field elements are never mutated in place so it can be reused freely"""
+    ONE: "Scalar"
+    """Shared one element, reused like `ZERO`"""
+
+    _intern: dict[int, "Scalar"] = {}
+    """Shared elements of the small integers, filled on demand by `of`"""
+
+    @classmethod
+    def of(cls, n: int) -> "Scalar":
+        """
+        Gets the field element of the integer `n`.
+
+        Like CPython does for small ints, a single instance is shared for each small integer (`-256 < n < 256`),
+        which are the values coming up over and over in selector polynomials (0, 1, -1, ...).
+        """
+        if -256 < n < 256:
+            element = cls._intern.get(n)
+            if element is None:
+                element = cls._intern[n] = cls(n)
+            return element
+        return cls(n)
+
+    def __pow__(self, exponent: int) -> "Scalar":
+        """
+        Raises the scalar to an integer power.
+
+        The inherited implementation squares and multiplies field elements recursively in Python,
+        this one computes the power on the plain integer in a single call.
+        """
+        return type(self)(powmod(self.n, exponent, self.field_modulus))
+
+    @classmethod
+    def zeros(cls, n: int) -> list["Scalar"]:
+        """Gets a list of `n` zeros, all sharing the `ZERO` element"""
+        return [cls.ZERO] * n
+
+    @classmethod
+    def ones(cls, n: int) -> list["Scalar"]:
+        """Gets a list of `n` ones, all sharing the `ONE` element"""
+        return [cls.ONE] * n
 
     @classmethod
     def root_of_unity(cls, group_order: int):
@@ -37,10 +100,33 @@ class Scalar(Field):
         Therefore, 𝑥^((𝑞−1)/𝑛) is an 𝑛-th root of unity. Note that you can end up with any of the 𝑛 𝑛-th roots of unity (including 1 itself), each with probability 1/𝑛.
 
         """
-        return Scalar(5) ** ((cls.field_modulus - 1) // group_order)
+        return Scalar(
+            powmod(5, (cls.field_modulus - 1) // group_order, cls.field_modulus)
+        )
 
     @classmethod
-    def roots_of_unity(cls, group_order: int):
+    @functools.lru_cache(maxsize=None)
+    def roots_of_unity_int(cls, group_order: int) -> tuple[int, ...]:
+        """
+        Gets the full list of roots of unity of a given group order, as plain integers reduced modulo the field modulus.
+
+        This is the integer counterpart of `roots_of_unity` for callers doing their own modular arithmetic.
+        Each root is the previous one times the first root of unity, computed on Python ints to skip the
+        field element dispatch, and the result is cached per group order.
+        """
+        # Bind the modulus and the current root to locals, the loop body is then plain int arithmetic
+        p = _P
+        w = cls.root_of_unity(group_order).n
+        x = 1
+        o = [x]
+        for _ in range(group_order - 1):
+            x = x * w % p
+            o.append(x)
+        return tuple(o)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def roots_of_unity(cls, group_order: int) -> tuple["Scalar", ...]:
         """
         Gets the full list of roots of unity of a given group order.
 
@@ -49,8 +135,39 @@ class Scalar(Field):
 
         - If 𝑛 is relatively prime to 𝑞−1, then there is only one 𝑛-th root of unity, i.e. 1 itself.
         - If 𝑛 divides 𝑞−1, then there are 𝑛 roots of unity.
+
+        The roots are computed once per group order and cached, so they are returned as an immutable tuple shared by all callers.
         """
-        o = [Scalar(1), cls.root_of_unity(group_order)]
-        while len(o) < group_order:
-            o.append(o[-1] * o[1])
-        return o
+        roots = cls.roots_of_unity_int(group_order)
+        # The first root is always 1, which reuses the shared element
+        return (cls.ONE,) + tuple(map(cls, roots[1:]))
+
+
+# The shared elements can only be built once the class is defined
+Scalar.ZERO = Scalar.of(0)
+Scalar.ONE = Scalar.of(1)
+
+
+def batch_inverse(xs: list[int], modulus: int = _P) -> list[int]:
+    """
+    Gets the inverses of the non-zero integers `xs` modulo `modulus` with Montgomery's trick.
+
+    Each inversion is an extended Euclidean run, far more expensive than a multiplication. Instead of
+    inverting every element, the prefix products are inverted once and the inverses are recovered by
+    sweeping backwards: one inversion and about `3n` multiplications for `n` elements.
+
+    The modulus defaults to the scalar field, pass `b.field_modulus` for coordinates of curve points.
+    """
+    # prefix[i] is the product of xs[:i]
+    prefix = [1] * (len(xs) + 1)
+    for i, x in enumerate(xs):
+        assert x % modulus != 0, "Zero has no inverse"
+        prefix[i + 1] = prefix[i] * x % modulus
+
+    # Inverse of the product of all the elements, then peel them off one by one
+    acc = powmod(prefix[-1], -1, modulus)
+    inverses = [0] * len(xs)
+    for i in range(len(xs) - 1, -1, -1):
+        inverses[i] = acc * prefix[i] % modulus
+        acc = acc * xs[i] % modulus
+    return inverses
@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from curve import Scalar, _P
+
+
+@dataclass(slots=True, frozen=True)
+class ScalarVec:
+    """
+    A batch of scalars over `𝔽p` stored as a structure of arrays: a single list of plain integers reduced modulo `p`.
+
+    A `list[Scalar]` is an array of structures, where every element is a boxed `Scalar` and every operation
+    dispatches through its methods and allocates a new `Scalar`. A `ScalarVec` runs element-wise operations
+    directly on the integers, and converts to and from `Scalar`s only at module boundaries.
+    """
+
+    values: list[int]
+    """The integers representing the scalars, each one in `[0, p)`"""
+
+    @classmethod
+    def from_ints(cls, values: list[int]) -> "ScalarVec":
+        """Builds a batch from arbitrary integers, reducing them modulo `p`"""
+        return cls([x % _P for x in values])
+
+    @classmethod
+    def from_scalars(cls, scalars: list[Scalar]) -> "ScalarVec":
+        """Builds a batch from a list of `Scalar`s"""
+        return cls([x.n for x in scalars])
+
+    def to_scalars(self) -> list[Scalar]:
+        """Converts the batch back to a list of `Scalar`s"""
+        return [Scalar(x) for x in self.values]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __add__(self, other: "ScalarVec") -> "ScalarVec":
+        assert len(self.values) == len(other.values)
+        return ScalarVec([(a + b) % _P for a, b in zip(self.values, other.values)])
+
+    def __sub__(self, other: "ScalarVec") -> "ScalarVec":
+        assert len(self.values) == len(other.values)
+        return ScalarVec([(a - b) % _P for a, b in zip(self.values, other.values)])
+
+    def __mul__(self, other: "ScalarVec") -> "ScalarVec":
+        assert len(self.values) == len(other.values)
+        return ScalarVec([a * b % _P for a, b in zip(self.values, other.values)])
+
+    def scale(self, factor: Scalar) -> "ScalarVec":
+        """Multiplies every scalar of the batch by the same `factor`"""
+        k = factor.n
+        return ScalarVec([x * k % _P for x in self.values])
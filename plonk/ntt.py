@@ -0,0 +1,65 @@
+import functools
+from curve import Scalar, _P, powmod
+
+
+@functools.lru_cache(maxsize=None)
+def bit_reversal(n: int) -> tuple[int, ...]:
+    """
+    Gets the bit-reversal permutation of `range(n)` for a power of two `n`.
+
+    The iterative Cooley-Tukey transform reads its input in bit-reversed order, so the table is
+    computed once per size and cached.
+    """
+    assert n > 0 and n & (n - 1) == 0, "The size must be a power of two"
+    bits = n.bit_length() - 1
+    rev = [0] * n
+    for i in range(1, n):
+        rev[i] = (rev[i >> 1] >> 1) | ((i & 1) << (bits - 1))
+    return tuple(rev)
+
+
+@functools.lru_cache(maxsize=None)
+def _inverse_roots_of_unity(n: int) -> tuple[int, ...]:
+    """Gets the inverses of the `n`-th roots of unity, i.e. the roots walked backwards: `ω^-i = ω^(n-i)`"""
+    roots = Scalar.roots_of_unity_int(n)
+    return (roots[0],) + roots[:0:-1]
+
+
+def _transform(values: list[int], roots: tuple[int, ...]) -> list[int]:
+    """Radix-2 Cooley-Tukey butterflies over plain integers, using `roots` as the twiddle factors"""
+    n = len(values)
+    a = [values[r] for r in bit_reversal(n)]
+    size = 2
+    while size <= n:
+        half = size // 2
+        step = n // size
+        twiddles = roots[::step][:half]
+        for start in range(0, n, size):
+            for j, w in enumerate(twiddles, start):
+                u = a[j]
+                v = a[j + half] * w % _P
+                a[j] = (u + v) % _P
+                a[j + half] = (u - v) % _P
+        size *= 2
+    return a
+
+
+def ntt(coeffs: list[int]) -> list[int]:
+    """
+    Evaluates the polynomial with the given coefficients over the `n`-th roots of unity, where `n = len(coeffs)`.
+
+    This is the monomial to Lagrange basis conversion in `O(n log n)` field multiplications, instead of the
+    `O(n²)` of evaluating the polynomial at each root one by one.
+    """
+    return _transform(coeffs, Scalar.roots_of_unity_int(len(coeffs)))
+
+
+def intt(evals: list[int]) -> list[int]:
+    """
+    Interpolates the coefficients of the polynomial taking the given values over the `n`-th roots of unity.
+
+    This is the inverse of `ntt`: the same transform with the inverse roots, scaled by `1/n`.
+    """
+    n = len(evals)
+    n_inv = powmod(n, -1, _P)
+    return [x * n_inv % _P for x in _transform(evals, _inverse_roots_of_unity(n))]
@@ -1,6 +1,13 @@
+import os
 from curve import Scalar
+from curve_vec import ScalarVec
+from ntt import ntt, intt
 from enum import Enum
 
+# Checking the type of every value costs a Python-level loop on each polynomial construction,
+# so it only runs when the `PLONK_STRICT` environment variable is set (and assertions are enabled)
+_STRICT = __debug__ and bool(os.environ.get("PLONK_STRICT"))
+
 
 class Basis(Enum):
     LAGRANGE = 1
@@ -12,7 +19,26 @@ class Polynomial:
     basis: Basis
 
     def __init__(self, values: list[Scalar], basis: Basis):
-        assert all(isinstance(x, Scalar) for x in values)
+        if _STRICT:
+            assert all(isinstance(x, Scalar) for x in values)
         assert isinstance(basis, Basis)
         self.values = values
         self.basis = basis
+
+    def to_monomial(self) -> "Polynomial":
+        """
+        Converts a polynomial given by its values over the roots of unity to its coefficients,
+        through an inverse NTT on plain integers.
+        """
+        assert self.basis == Basis.LAGRANGE
+        evals = ScalarVec.from_scalars(self.values)
+        return Polynomial(ScalarVec(intt(evals.values)).to_scalars(), Basis.MONOMIAL)
+
+    def to_lagrange(self) -> "Polynomial":
+        """
+        Converts a polynomial given by its coefficients to its values over the roots of unity,
+        through an NTT on plain integers.
+        """
+        assert self.basis == Basis.MONOMIAL
+        coeffs = ScalarVec.from_scalars(self.values)
+        return Polynomial(ScalarVec(ntt(coeffs.values)).to_scalars(), Basis.LAGRANGE)
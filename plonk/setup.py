@@ -44,15 +44,18 @@ class Setup(object):
 
     @classmethod
     def from_file(cls, filename):
-        # Read the content of the ptau file into a binary buffer.
-        ptau_content = open(filename, "rb").read()
+        # Read the content of the ptau file into a binary buffer, in a single read.
+        with open(filename, "rb") as f:
+            ptau_content = f.read()
         # Extract the number of powers, which is located at a specific position in the file.
         powers = 2 ** ptau_content[SETUP_FILE_POWERS_POS]
+        # View the buffer without copying it, so that slicing out each element does not allocate a new bytes object.
+        ptau_view = memoryview(ptau_content)
         # Extract G1 points, starting at byte 80 in the file, and convert them to integers.
         values = [
             # Convert arrays of bytes to integers using little-endian byte order
-            # by extracting a chunk of bytes from ptau_content and interpreting it as an integer.
-            int.from_bytes(ptau_content[i : i + SETUP_ELEMENT_SIZE], "little")
+            # by viewing a chunk of bytes of ptau_content and interpreting it as an integer.
+            int.from_bytes(ptau_view[i : i + SETUP_ELEMENT_SIZE], "little")
             for i in range(
                 # We start at byte 80 in the file, the beginning of G1 points.
                 SETUP_FILE_G1_STARTPOS,
@@ -71,34 +74,24 @@ class Setup(object):
         # are scaled by a factor (possibly for Montgomery optimization). We can
         # determine this factor since we know the first point is the generator.
         factor = b.FQ(values[0]) / b.G1[0]
+        # Dividing is a modular inversion, so the factor is inverted once and every value is multiplied by its inverse.
+        # (`factor ** -1` does not work here, the field elements only support non-negative exponents.)
+        factor_inv = 1 / factor
         # Normalize all points by dividing each value by the previously extracted factor.
-        values = [b.FQ(x) / factor for x in values]
+        values = [b.FQ(x) * factor_inv for x in values]
 
         # Create (x, y) point pairs from the normalized values for future use.
         powers_of_tau = [(values[i * 2], values[i * 2 + 1]) for i in range(powers)]
         # Print the second (X^1) point from the extracted G1 side.
         print("Extracted G1 side, X^1 point: {}".format(powers_of_tau[1]))
 
-        # Find the position where G2 points start in the 'ptau_content' by searching for 'target.'
-        pos_start_g2 = next(
-            (
-                pos
-                for pos, _ in enumerate(
-                    # Iterate through the 'ptau_content' starting at the G1 position.
-                    ptau_content[SETUP_FILE_G1_STARTPOS:],
-                    SETUP_FILE_G1_STARTPOS,
-                )
-                # Check if the current 32-byte slice, converted to an integer in little-endian order,
-                # equals the 'target' value (factor * b.G2[0].coeffs[0]).n.
-                if int.from_bytes(
-                    ptau_content[pos : pos + SETUP_ELEMENT_SIZE], "little"
-                )
-                == (factor * ECC_G2[0].coeffs[0]).n
-            ),
-            # If 'target' is not found, return 'None.'
-            None,
-        )
-        assert pos_start_g2 is not None
+        # Find the position where G2 points start in the 'ptau_content' by searching for 'target':
+        # the first coordinate of the G2 generator, scaled by the factor, as 32 little-endian bytes.
+        target = (factor * ECC_G2[0].coeffs[0]).n.to_bytes(SETUP_ELEMENT_SIZE, "little")
+        # Search the raw bytes directly, starting at the G1 position, instead of converting every 32-byte slice.
+        pos_start_g2 = ptau_content.find(target, SETUP_FILE_G1_STARTPOS)
+        # 'find' returns -1 if 'target' is not found.
+        assert pos_start_g2 != -1
         # Print the result if 'pos'
         print("Detected start of G2 side at byte {}.".format(pos_start_g2))
 
@@ -117,7 +110,7 @@ class Setup(object):
                             "little",
                         )
                     )
-                    / factor,
+                    * factor_inv,
                     # Extract and normalize the second component.
                     b.FQ(
                         int.from_bytes(
@@ -129,7 +122,7 @@ class Setup(object):
                             "little",
                         )
                     )
-                    / factor,
+                    * factor_inv,
                 ]
             ),
             b.FQ2(
@@ -145,7 +138,7 @@ class Setup(object):
                             "little",
                         )
                     )
-                    / factor,
+                    * factor_inv,
                     # Extract and normalize the fourth component.
                     b.FQ(
                         int.from_bytes(
@@ -157,7 +150,7 @@ class Setup(object):
                             "little",
                         )
                     )
-                    / factor,
+                    * factor_inv,
                 ]
             ),
         )
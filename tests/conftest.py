@@ -1,6 +1,14 @@
+import os
 import sys
 import pytest
 
+# the plonk modules import each other as top-level modules (e.g. `from curve import Scalar`),
+# so the package directory itself must be importable
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "plonk"),
+)
+
 
 # each test runs on cwd to its temp dir
 @pytest.fixture(autouse=True)
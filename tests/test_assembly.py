@@ -0,0 +1,31 @@
+import pytest
+from compiler.assembly import eq_to_assembly, evaluate
+
+
+def test_evaluate_accumulates_repeated_terms():
+    assert evaluate(["a", "+", "a"]) == {"a": 2}
+    assert evaluate(["a", "-", "a"]) == {"a": 0}
+    assert evaluate(["a", "+", "b", "+", "a"]) == {"a": 2, "b": 1}
+    assert evaluate(["a", "*", "b", "-", "2", "*", "b", "*", "a"]) == {("a", "b"): -1}
+
+
+def test_evaluate_negates_whole_product_terms():
+    assert evaluate(["a", "*", "c", "-", "45", "*", "a", "+", "987"]) == {
+        ("a", "c"): 1,
+        "a": -45,
+        "": 987,
+    }
+
+
+def test_simplify_drops_cancelled_variables():
+    eqn = eq_to_assembly("e <== a + b + 0 * c", simplify=True)
+    assert eqn.wires.as_list() == ["a", "b", "e"]
+
+    eqn = eq_to_assembly("c <== a * b - b * a + d", simplify=True)
+    assert eqn.wires.as_list() == ["d", "d", "c"]
+    assert eqn.coeffs_raw() == (-1, 0, 0, 1, 0)
+
+
+def test_cancelled_variables_take_a_wire_without_simplify():
+    with pytest.raises(Exception):
+        eq_to_assembly("e <== a + b + 0 * c")
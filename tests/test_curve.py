@@ -0,0 +1,17 @@
+import py_ecc.bn128 as b
+from curve import Scalar, batch_inverse
+
+
+def test_batch_inverse():
+    xs = [1, 2, 3, 2**200, Scalar.field_modulus - 1]
+    assert batch_inverse(xs) == [(1 / Scalar(x)).n for x in xs]
+    assert batch_inverse(xs, b.field_modulus) == [(1 / b.FQ(x)).n for x in xs]
+    assert batch_inverse([]) == []
+
+
+def test_scalar_pow():
+    x = Scalar(2**200 + 7)
+    assert x**0 == Scalar(1)
+    assert x**5 == x * x * x * x * x
+    assert x**-1 * x == Scalar(1)
+    assert x ** (Scalar.field_modulus - 1) == Scalar(1)
@@ -0,0 +1,14 @@
+from curve import Scalar
+from curve_vec import ScalarVec
+
+
+def test_scalar_vec_matches_scalar_arithmetic():
+    xs = [Scalar(3), Scalar(-1), Scalar(0), Scalar(2**200)]
+    ys = [Scalar(5), Scalar(7), Scalar(-9), Scalar(2**250)]
+    vx, vy = ScalarVec.from_scalars(xs), ScalarVec.from_scalars(ys)
+
+    assert (vx + vy).to_scalars() == [x + y for x, y in zip(xs, ys)]
+    assert (vx - vy).to_scalars() == [x - y for x, y in zip(xs, ys)]
+    assert (vx * vy).to_scalars() == [x * y for x, y in zip(xs, ys)]
+    assert vx.scale(Scalar(-2)).to_scalars() == [x * -2 for x in xs]
+    assert ScalarVec.from_ints([-1, 2]).to_scalars() == [Scalar(-1), Scalar(2)]
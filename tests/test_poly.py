@@ -0,0 +1,16 @@
+from curve import Scalar
+from poly import Polynomial, Basis
+
+
+def test_basis_conversion_round_trip():
+    coeffs = [Scalar(x) for x in (3, -1, 0, 7, 2**200, 5, 0, 1)]
+    poly = Polynomial(coeffs, Basis.MONOMIAL)
+
+    evals = poly.to_lagrange()
+    assert evals.basis == Basis.LAGRANGE
+    for w, y in zip(Scalar.roots_of_unity(len(coeffs)), evals.values):
+        assert y == sum((c * w**i for i, c in enumerate(coeffs)), Scalar.ZERO)
+
+    back = evals.to_monomial()
+    assert back.basis == Basis.MONOMIAL
+    assert back.values == coeffs